@@ -13,14 +13,15 @@ from sqlalchemy.orm import Session
 from app.core.auth import get_current_active_user
 from app.core.config import settings
 from app.api.dependencies import get_db
-from app.models import Meal, User, UserMealLog
+from app.models import Meal, User
 from app.schemas import (
     Meal as MealSchema,
     MealResponse, MealType,
-    MealComponent
+    MealComponent, SparseMealResponse
     )
 from app.services.nutrition import calculate_meal_nutrition
-from app.services.meals import format_meal_response
+from app.services.meals import format_meal_response, format_meal_list, parse_meal_fieldset, write_meal
+from app.services.write_coalescer import meal_write_coalescer
 
 router = APIRouter(prefix="/meals", tags=["Meals"])
 
@@ -52,30 +53,22 @@ async def create_meal(
         
         image_path = f"/static/{filename}"
 
-    # Create meal
-    db_meal = Meal(
-        meal_type=meal_type,
-        name=name,
-        image_path=image_path,
-        owner_id=current_user.id,
-        timestamp=datetime.utcnow()
-    )
-    db.add(db_meal)
-    db.commit()
-    db.refresh(db_meal)
-
-    # Add meal components
-    for component in validated_components:
-        db_component = UserMealLog(
-            meal_id=db_meal.id,
-            food_id=component.food_id,
-            quantity=component.quantity,
-            preparation_notes=component.preparation_notes
-        )
-        db.add(db_component)
-    
-    db.commit()
-    db.refresh(db_meal)
+    # Create meal, its components and aggregates in one transaction
+    meal = {
+        "owner_id": current_user.id,
+        "meal_type": meal_type,
+        "name": name,
+        "image_path": image_path,
+        "components": [c.model_dump() for c in validated_components],
+        "timestamp": datetime.utcnow()
+    }
+    if settings.WRITE_COALESCING_ENABLED:
+        meal_id = await meal_write_coalescer.write(**meal)
+        db_meal = db.get(Meal, meal_id)
+    else:
+        db_meal = write_meal(db, **meal)
+        db.commit()
+        db.refresh(db_meal)
 
     # Calculate nutrition
     nutrition = calculate_meal_nutrition(db_meal, db)
@@ -87,19 +80,26 @@ async def create_meal(
     }
 
 
-@router.get("", response_model=List[MealResponse])
+@router.get("", response_model=List[SparseMealResponse], response_model_exclude_unset=True)
 def get_meals(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = None,  # e.g. "id,name,timestamp,nutrition.calories"
+    include: Optional[str] = None,  # e.g. "food_names"
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """List all meals with nutrition data"""
+    """List all meals with nutrition data, optionally limited to some fields"""
+    try:
+        selected, nutrients, includes = parse_meal_fieldset(fields, include)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+
     meals = db.query(Meal).filter(
         Meal.owner_id == current_user.id
     ).order_by(Meal.timestamp.desc()).offset(skip).limit(limit).all()
 
-    return [format_meal_response(meal, db) for meal in meals]
+    return format_meal_list(meals, db, selected, nutrients, includes)
 
 
 @router.get("/{meal_id}", response_model=MealResponse)
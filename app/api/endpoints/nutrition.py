@@ -1,19 +1,28 @@
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.api.dependencies import get_db
-from app.models import Meal, User
+from app.models import FoodItem, Meal, User
 from app.core.auth import get_current_active_user
-from app.schemas.nutrition import DailyNutritionResponse
-from app.services.nutrition import calculate_meal_nutrition
-from app.services.meals import format_meal_response
+from app.core.config import settings
+from app.schemas.nutrition import DailyNutritionResponse, FoodSuggestionResponse, NutritionTrendResponse
+from app.services.nutrition import calculate_meals_nutrition, NUTRIENT_FIELDS
+from app.services.meals import format_meal_list, parse_meal_fieldset
+from app.services.suggestions import food_index_cache, get_day_nutrition
+from app.services.trends import compute_nutrition_trend, ensure_daily_aggregates
+
+MAX_TREND_DAYS = 366 * 5
+MAX_TREND_WINDOW = 365
 
 
 router = APIRouter(prefix="/nutrition", tags=["Nutrition"])
 
-@router.get("/daily", response_model=DailyNutritionResponse)
+@router.get("/daily", response_model=DailyNutritionResponse, response_model_exclude_unset=True)
 def get_daily_nutrition(
     date: str,  # Expects YYYY-MM-DD format
+    fields: Optional[str] = None,  # Meal fields, e.g. "id,name,timestamp,nutrition.calories"
+    include: Optional[str] = None,  # e.g. "food_names"
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -23,6 +32,11 @@ def get_daily_nutrition(
     except ValueError:
         raise HTTPException(400, detail="Invalid date format. Use YYYY-MM-DD")
 
+    try:
+        selected, nutrients, includes = parse_meal_fieldset(fields, include)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+
     # Calculate date range (00:00 to 23:59)
     start_datetime = datetime.combine(target_date, datetime.min.time())
     end_datetime = start_datetime + timedelta(days=1)
@@ -44,12 +58,94 @@ def get_daily_nutrition(
         "meals": []
     }
 
-    for meal in meals:
-        nutrition = calculate_meal_nutrition(meal, db)
-        totals["total_calories"] += nutrition["calories"]
-        totals["total_protein"] += nutrition["protein"]
-        totals["total_carbs"] += nutrition["carbs"]
-        totals["total_fats"] += nutrition["fats"]
-        totals["meals"].append(format_meal_response(meal, db))
+    nutrition_by_meal = calculate_meals_nutrition([meal.id for meal in meals], db)
+    for nutrition in nutrition_by_meal.values():
+        totals["total_calories"] += nutrition.get("calories", 0)
+        totals["total_protein"] += nutrition.get("protein", 0)
+        totals["total_carbs"] += nutrition.get("carbs", 0)
+        totals["total_fats"] += nutrition.get("fats", 0)
+
+    totals["meals"] = format_meal_list(
+        meals, db, selected, nutrients, includes, nutrition=nutrition_by_meal
+    )
+    return totals
+
+@router.get("/trends", response_model=NutritionTrendResponse)
+def get_nutrition_trends(
+    nutrient: str = "calories",
+    start: Optional[str] = None,  # YYYY-MM-DD, defaults to 30 days before end
+    end: Optional[str] = None,  # YYYY-MM-DD, defaults to today
+    windows: List[int] = Query([7, 30]),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Rolling averages, min/max and meal-type shares for a nutrient.
+
+    Served from per-day aggregates, rebuilt from the live catalog whenever
+    it has changed since they were computed.
+    """
+    if nutrient not in NUTRIENT_FIELDS:
+        raise HTTPException(400, detail=f"Unknown nutrient: {nutrient}")
+
+    try:
+        end_date = datetime.strptime(end, "%Y-%m-%d").date() if end else datetime.utcnow().date()
+        start_date = datetime.strptime(start, "%Y-%m-%d").date() if start else end_date - timedelta(days=29)
+    except ValueError:
+        raise HTTPException(400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    if start_date > end_date:
+        raise HTTPException(400, detail="start must not be after end")
+    if (end_date - start_date).days + 1 > MAX_TREND_DAYS:
+        raise HTTPException(400, detail=f"Date range cannot exceed {MAX_TREND_DAYS} days")
+    if not windows or any(w < 1 or w > MAX_TREND_WINDOW for w in windows):
+        raise HTTPException(400, detail=f"Windows must be between 1 and {MAX_TREND_WINDOW} days")
+
+    ensure_daily_aggregates(current_user.id, db)
+    return compute_nutrition_trend(current_user.id, nutrient, start_date, end_date, windows, db)
+
+
+@router.get("/suggestions", response_model=FoodSuggestionResponse)
+def get_food_suggestions(
+    date: Optional[str] = None,  # YYYY-MM-DD, defaults to today
+    k: int = Query(10, ge=1, le=100),
+    food_type: Optional[str] = None,
+    state: Optional[str] = None,
+    calories: Optional[float] = Query(None, ge=0),  # Target overrides
+    protein: Optional[float] = Query(None, ge=0),
+    carbs: Optional[float] = Query(None, ge=0),
+    fats: Optional[float] = Query(None, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Suggest catalog foods that best close the gap to the day's targets"""
+    try:
+        target_date = datetime.strptime(date, "%Y-%m-%d").date() if date else datetime.utcnow().date()
+    except ValueError:
+        raise HTTPException(400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    if food_type is not None and food_type not in FoodItem.__table__.c.food_type.type.enums:
+        raise HTTPException(400, detail=f"Unknown food_type: {food_type}")
+    if state is not None and state not in FoodItem.__table__.c.state.type.enums:
+        raise HTTPException(400, detail=f"Unknown state: {state}")
+
+    overrides = {"calories": calories, "protein": protein, "carbs": carbs, "fats": fats}
+    targets = {
+        field: value if overrides[field] is None else overrides[field]
+        for field, value in settings.DEFAULT_NUTRITION_TARGETS.items()
+    }
+
+    ensure_daily_aggregates(current_user.id, db)
+    consumed = get_day_nutrition(current_user.id, target_date, db)
+    remaining = {field: max(targets[field] - consumed[field], 0.0) for field in targets}
 
-    return totals
\ No newline at end of file
+    index = food_index_cache.get(db)
+    return {
+        "date": target_date,
+        "targets": targets,
+        "consumed": consumed,
+        "remaining": remaining,
+        "suggestions": index.query(
+            remaining, k=k, food_type=food_type, state=state,
+            max_quantity=settings.SUGGESTION_MAX_QUANTITY_G
+        )
+    }
\ No newline at end of file
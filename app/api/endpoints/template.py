@@ -0,0 +1,120 @@
+# Standard Library
+from typing import List, Optional
+
+# Third Party
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+# Local Application
+from app.core.auth import get_current_active_user
+from app.core.config import settings
+from app.api.dependencies import get_db
+from app.models import Meal, MealTemplate, User
+from app.schemas import (
+    Meal as MealSchema,
+    MealResponse,
+    MealTemplate as MealTemplateSchema,
+    MealTemplateCreate
+    )
+from app.services.catalog import get_catalog_version
+from app.services.nutrition import calculate_components_nutrients, summarize_nutrients
+from app.services.meals import write_meal
+from app.services.templates import refresh_template_nutrition, template_meal_write
+from app.services.write_coalescer import meal_write_coalescer
+
+router = APIRouter(prefix="/meals/templates", tags=["Meal Templates"])
+
+
+def get_owned_template(template_id: int, db: Session, current_user: User) -> MealTemplate:
+    template = db.query(MealTemplate).filter(
+        MealTemplate.id == template_id,
+        MealTemplate.owner_id == current_user.id
+    ).first()
+
+    if not template:
+        raise HTTPException(404, detail="Meal template not found")
+    return template
+
+
+@router.post("", response_model=MealTemplateSchema, status_code=status.HTTP_201_CREATED)
+def create_meal_template(
+    template: MealTemplateCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Save a meal as a template with its nutrition precomputed"""
+    try:
+        nutrition = calculate_components_nutrients(template.components, db)
+    except KeyError as e:
+        raise HTTPException(400, detail=f"No nutrition data for food {e.args[0]}")
+
+    db_template = MealTemplate(
+        owner_id=current_user.id,
+        name=template.name,
+        meal_type=template.meal_type,
+        components=[c.model_dump() for c in template.components],
+        nutrition=nutrition,
+        catalog_version=get_catalog_version(db)
+    )
+    db.add(db_template)
+    db.commit()
+    db.refresh(db_template)
+    return db_template
+
+
+@router.get("", response_model=List[MealTemplateSchema])
+def get_meal_templates(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List the current user's meal templates"""
+    return db.query(MealTemplate).filter(
+        MealTemplate.owner_id == current_user.id
+    ).order_by(MealTemplate.name).all()
+
+
+@router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_meal_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete a meal template (meals already logged from it are kept)"""
+    template = get_owned_template(template_id, db, current_user)
+    db.delete(template)
+    db.commit()
+
+
+@router.post("/{template_id}/log", response_model=MealResponse)
+async def log_meal_template(
+    template_id: int,
+    name: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Log a new meal from a saved template"""
+    template = get_owned_template(template_id, db, current_user)
+
+    # Only recomputed (and committed) when the catalog moved on
+    try:
+        if refresh_template_nutrition(template, db):
+            db.commit()
+    except KeyError as e:
+        db.rollback()
+        raise HTTPException(409, detail=f"Template references food {e.args[0]} with no nutrition data")
+
+    # Copied components and totals, written like any other meal
+    meal = template_meal_write(template, name=name)
+    if settings.WRITE_COALESCING_ENABLED:
+        meal_id = await meal_write_coalescer.write(**meal)
+        db_meal = db.get(Meal, meal_id)
+    else:
+        db_meal = write_meal(db, **meal)
+        db.commit()
+        db.refresh(db_meal)
+
+    return {
+        **MealSchema.model_validate(db_meal).model_dump(),
+        "nutrition": summarize_nutrients(meal["nutrients"]),
+        "components": meal["components"]
+    }
\ No newline at end of file
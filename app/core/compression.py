@@ -0,0 +1,29 @@
+from brotli_asgi import BrotliMiddleware
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+
+
+class CompressionMiddleware:
+    """Negotiated response compression: brotli when accepted, else gzip.
+
+    Wraps two encoders rather than relying on BrotliMiddleware's own gzip
+    fallback, which ignores the configured gzip level.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        brotli_quality: int = 4,
+        gzip_level: int = 6
+    ):
+        self.brotli = BrotliMiddleware(
+            app, quality=brotli_quality, minimum_size=minimum_size, gzip_fallback=False
+        )
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "br" in Headers(scope=scope).get("accept-encoding", ""):
+            await self.brotli(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
\ No newline at end of file
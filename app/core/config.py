@@ -11,12 +11,21 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./sql_app.db"
     
+    # Meal writes are group-committed by a single writer thread
+    WRITE_COALESCING_ENABLED: bool = True
+    WRITE_COALESCE_MAX_BATCH: int = 64
+    WRITE_COALESCE_MAX_DELAY_MS: float = 5.0
+    
     # Authentication
     SECRET_KEY: str = "your-secret-key-here"  # Change to env var in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
     
+    # Nutrition Targets (daily; also used to normalize suggestion vectors)
+    DEFAULT_NUTRITION_TARGETS: dict = {"calories": 2000.0, "protein": 50.0, "carbs": 275.0, "fats": 78.0}
+    SUGGESTION_MAX_QUANTITY_G: float = 500.0
+    
     # File Storage
     STATIC_FILES_DIR: str = str(Path(__file__).parent.parent / "static")
     MAX_FILE_SIZE_MB: int = 10
@@ -24,6 +33,27 @@ class Settings(BaseSettings):
     # CORS
     ALLOWED_ORIGINS: list = ["*"]
 
+    # Rate Limiting ("METHOD /path" -> per-user / per-IP token buckets)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict = {
+        "POST /meals": {"user": "60/minute", "ip": "120/minute"},
+        "POST /meals/templates/{template_id}/log": {"user": "60/minute", "ip": "120/minute"},
+        "POST /auth/refresh": {"user": "10/minute", "ip": "30/minute"},
+        "POST /auth/token": {"ip": "10/minute"},
+        "POST /auth/register": {"ip": "5/minute"},
+    }
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" or "sqlite" (shared across local workers)
+    RATE_LIMIT_SQLITE_PATH: str = "./rate_limits.db"
+    RATE_LIMIT_TRUSTED_PROXIES: int = 0  # Proxies appending X-Forwarded-For (0 ignores the header)
+    MAX_CONCURRENT_REQUESTS: int = 64  # Beyond this, shed load with 503 (0 disables)
+    LOAD_SHED_RETRY_AFTER_SECONDS: int = 1
+
+    # Response Compression (brotli for clients that accept it, gzip otherwise)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; smaller responses are sent as-is
+    GZIP_COMPRESS_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
     class Config:
         case_sensitive = True
         env_file = ".env"  # For production environment variables
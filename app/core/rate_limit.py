@@ -0,0 +1,322 @@
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import anyio
+from jose import JWTError, jwt
+
+from .config import settings
+
+# (bucket key, capacity, refill rate in tokens/second)
+BucketCheck = Tuple[str, float, float]
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> Tuple[float, float]:
+    """Parse "30/minute" into (capacity, tokens per second)"""
+    count, _, period = rate.partition("/")
+    try:
+        capacity = float(count)
+        seconds = PERIODS[period.strip().rstrip("s")]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit: {rate!r}, expected e.g. '30/minute'")
+    return capacity, capacity / seconds
+
+
+# --------------------------
+# Bucket Stores
+# --------------------------
+
+class MemoryBucketStore:
+    """Token buckets held in this process.
+
+    Bounded to ``max_keys`` buckets with least-recently-used eviction, so every
+    acquire is O(1). The evicted bucket is the one idle longest, which has
+    almost always refilled, and a missing bucket behaves like a full one.
+    """
+
+    blocking = False  # Cheap enough to call on the event loop
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def acquire(self, checks: List[BucketCheck]) -> float:
+        """Take one token from every bucket, or none of them.
+
+        Returns 0 if allowed, else the seconds until a retry could succeed.
+        """
+        if not checks:
+            return 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            states = []
+            retry_after = 0.0
+            for key, capacity, rate in checks:
+                tokens, updated = self._buckets.get(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated) * rate)
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) / rate)
+                states.append((key, tokens))
+
+            spend = 0 if retry_after else 1
+            for key, tokens in states:
+                self._buckets[key] = (tokens - spend, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+
+class SQLiteBucketStore:
+    """Token buckets in a local SQLite file shared by all worker processes.
+
+    Each row records when its bucket will be full again. Rows past that point
+    hold nothing a missing row would not, so every ``cleanup_every`` acquires
+    they are deleted inside the same transaction.
+    """
+
+    blocking = True  # May wait on the file lock, so called from a worker thread
+
+    def __init__(self, path: str, busy_timeout: float = 0.1, cleanup_every: int = 1000):
+        self.cleanup_every = cleanup_every
+        self._acquires = 0
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=busy_timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")  # Bucket state need not survive a crash
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(rate_limit_buckets)")}
+        if "full_at" not in columns:
+            self._conn.execute("ALTER TABLE rate_limit_buckets ADD COLUMN full_at REAL NOT NULL DEFAULT 0")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_full_at ON rate_limit_buckets (full_at)"
+        )
+        self._lock = threading.Lock()
+
+    def acquire(self, checks: List[BucketCheck]) -> float:
+        """Take one token from every bucket, or none of them (atomic across processes)"""
+        if not checks:
+            return 0.0
+
+        with self._lock:
+            self._acquires += 1
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                states = []
+                retry_after = 0.0
+                for key, capacity, rate in checks:
+                    row = cursor.execute(
+                        "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+                    ).fetchone()
+                    tokens, updated = row if row else (capacity, now)
+                    tokens = min(capacity, tokens + max(now - updated, 0.0) * rate)
+                    if tokens < 1:
+                        retry_after = max(retry_after, (1 - tokens) / rate)
+                    states.append((key, capacity, rate, tokens))
+
+                spend = 0 if retry_after else 1
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)",
+                    [
+                        (key, tokens - spend, now, now + (capacity - tokens + spend) / rate)
+                        for key, capacity, rate, tokens in states
+                    ]
+                )
+                if self._acquires % self.cleanup_every == 0:
+                    cursor.execute("DELETE FROM rate_limit_buckets WHERE full_at < ?", (now,))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            return retry_after
+
+
+def create_bucket_store():
+    """Bucket store selected by ``RATE_LIMIT_BACKEND``"""
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBucketStore(settings.RATE_LIMIT_SQLITE_PATH)
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryBucketStore()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND!r}")
+
+
+# --------------------------
+# Route Rules
+# --------------------------
+
+class RateLimitRule:
+    """Per-user and per-IP limits for one "METHOD /path" route"""
+
+    def __init__(self, route: str, limits: Dict[str, str]):
+        self.route = route
+        self.method, _, self.path = route.partition(" ")
+        unknown = set(limits) - {"user", "ip"}
+        if unknown:
+            raise ValueError(f"Unknown rate limit scope for {route}: {', '.join(sorted(unknown))}")
+        self.user = parse_rate(limits["user"]) if "user" in limits else None
+        self.ip = parse_rate(limits["ip"]) if "ip" in limits else None
+        self.pattern = re.compile("^" + re.sub(r"\{[^/]+\}", "[^/]+", self.path) + "$")
+
+    def checks(self, client_ip: Optional[str], username: Optional[str] = None) -> List[BucketCheck]:
+        checks = []
+        if self.user and username is not None:
+            checks.append((f"{self.route}|user:{username}", *self.user))
+        if self.ip and client_ip is not None:
+            checks.append((f"{self.route}|ip:{client_ip}", *self.ip))
+        return checks
+
+
+@lru_cache(maxsize=4096)
+def _token_subject(token: str) -> Optional[str]:
+    """Username from an access or refresh token, cached so repeat requests skip the HMAC"""
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+
+# --------------------------
+# Middleware
+# --------------------------
+
+class RateLimitMiddleware:
+    """ASGI middleware applying route token buckets and a global concurrency cap.
+
+    Requests arriving while ``max_concurrent`` are already in flight are
+    shed with 503 before touching any bucket, so shedding neither queues nor
+    costs the client tokens. Admitted requests over a route's per-user or
+    per-IP budget get 429. Both carry ``Retry-After``. Blocking stores run on
+    their own small thread limiter, never the endpoints' threadpool.
+
+    If the bucket store fails (e.g. the shared SQLite file stays locked), the
+    request is allowed and the error logged rather than failing it.
+    """
+
+    def __init__(
+        self,
+        app,
+        rules: Dict[str, Dict[str, str]],
+        store=None,
+        max_concurrent: int = 0,
+        shed_retry_after: int = 1,
+        trusted_proxies: int = 0,
+        store_threads: int = 4,
+        exempt_paths: Tuple[str, ...] = ("/health",)
+    ):
+        self.app = app
+        self.store = store if store is not None else MemoryBucketStore()
+        self.max_concurrent = max_concurrent
+        self.shed_retry_after = shed_retry_after
+        self.trusted_proxies = trusted_proxies
+        self.exempt_paths = set(exempt_paths)
+        self.in_flight = 0
+        self.store_threads = store_threads
+        self._store_limiter = None  # Created lazily inside the event loop
+
+        parsed = [RateLimitRule(route, limits) for route, limits in rules.items()]
+        self._exact = {(r.method, r.path): r for r in parsed if "{" not in r.path}
+        self._patterns = [r for r in parsed if "{" in r.path]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            await self._reject(send, 503, "Server busy, try again later", self.shed_retry_after)
+            return
+
+        self.in_flight += 1
+        try:
+            rule = self._match(scope["method"], scope["path"])
+            if rule is not None:
+                username = self._username(scope) if rule.user else None
+                retry_after = await self._acquire(rule.checks(self._client_ip(scope), username))
+                if retry_after:
+                    await self._reject(send, 429, "Rate limit exceeded", retry_after)
+                    return
+
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    def _match(self, method: str, path: str) -> Optional[RateLimitRule]:
+        rule = self._exact.get((method, path))
+        if rule is None:
+            for candidate in self._patterns:
+                if candidate.method == method and candidate.pattern.match(path):
+                    return candidate
+        return rule
+
+    async def _acquire(self, checks: List[BucketCheck]) -> float:
+        try:
+            if self.store.blocking:
+                if self._store_limiter is None:
+                    self._store_limiter = anyio.CapacityLimiter(self.store_threads)
+                return await anyio.to_thread.run_sync(
+                    self.store.acquire, checks, limiter=self._store_limiter
+                )
+            return self.store.acquire(checks)
+        except Exception:
+            logger.warning("Rate limit store unavailable, allowing request", exc_info=True)
+            return 0.0
+
+    def _client_ip(self, scope) -> Optional[str]:
+        if self.trusted_proxies:
+            # Each trusted proxy appends the address it received the request
+            # from, so only the right-most entries can be believed; anything
+            # further left is whatever the client chose to send
+            forwarded = [
+                entry.strip()
+                for name, value in scope["headers"] if name == b"x-forwarded-for"
+                for entry in value.decode("latin-1").split(",")
+            ]
+            if len(forwarded) >= self.trusted_proxies:
+                return forwarded[-self.trusted_proxies]
+        client = scope.get("client")
+        return client[0] if client else None
+
+    def _username(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    return _token_subject(token)
+
+        # /auth/refresh carries its token as a query parameter
+        if scope.get("query_string"):
+            tokens = parse_qs(scope["query_string"].decode("latin-1")).get("refresh_token")
+            if tokens:
+                return _token_subject(tokens[0])
+        return None
+
+    async def _reject(self, send, status: int, detail: str, retry_after: float) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -7,12 +7,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
 from app.core.database import engine
+from app.core.rate_limit import RateLimitMiddleware, create_bucket_store
 from app.models.base import Base
+from app.services.write_coalescer import meal_write_coalescer
 
 # Import all routers
 from app.api.endpoints.auth import router as auth_router
 from app.api.endpoints.meal import router as meals_router
+from app.api.endpoints.template import router as meal_templates_router
 from app.api.endpoints.nutrition import router as nutrition_router
 
 @asynccontextmanager
@@ -23,10 +27,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         Base.metadata.create_all(bind=engine)
         print("Database tables created")
     
+    if settings.WRITE_COALESCING_ENABLED:
+        meal_write_coalescer.start()
+
     yield  # App runs here
     
-    # Shutdown logic would go here
-    # (e.g., await database.disconnect())
+    # Shutdown logic
+    meal_write_coalescer.stop()  # Commits any queued meal writes
 
 
 def create_app():
@@ -41,6 +48,17 @@ def create_app():
     )
 
     # Setup middleware
+    if settings.RATE_LIMIT_ENABLED:
+        # Added before CORS so rejections still carry CORS headers
+        app.add_middleware(
+            RateLimitMiddleware,
+            rules=settings.RATE_LIMITS,
+            store=create_bucket_store(),
+            max_concurrent=settings.MAX_CONCURRENT_REQUESTS,
+            shed_retry_after=settings.LOAD_SHED_RETRY_AFTER_SECONDS,
+            trusted_proxies=settings.RATE_LIMIT_TRUSTED_PROXIES,
+        )
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.ALLOWED_ORIGINS,
@@ -49,6 +67,15 @@ def create_app():
         allow_headers=["*"],
     )
 
+    # Negotiated response compression (brotli when accepted, else gzip)
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            brotli_quality=settings.BROTLI_QUALITY,
+            gzip_level=settings.GZIP_COMPRESS_LEVEL,
+        )
+
     # Mount static files
     if not os.path.exists(settings.STATIC_FILES_DIR):
         os.makedirs(settings.STATIC_FILES_DIR)
@@ -60,6 +87,7 @@ def create_app():
 
     # Include all API routers
     app.include_router(auth_router)
+    app.include_router(meal_templates_router)  # Before meals so /meals/templates isn't read as a meal id
     app.include_router(meals_router)
     app.include_router(nutrition_router)
 
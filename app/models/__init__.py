@@ -1,5 +1,15 @@
 from .auth import User
-from .meal import Meal, UserMealLog
-from .food import FoodItem, NutritionalValue
+from .meal import Meal, UserMealLog, DailyNutritionAggregate, DailyAggregateBackfill, MealTemplate
+from .food import FoodItem, NutritionalValue, CatalogVersion
 
-__all__ = ["User", "Meal", "FoodItem", "NutritionalValue", "UserMealLog"]
\ No newline at end of file
+__all__ = [
+    "User",
+    "Meal",
+    "FoodItem",
+    "NutritionalValue",
+    "CatalogVersion",
+    "UserMealLog",
+    "DailyNutritionAggregate",
+    "DailyAggregateBackfill",
+    "MealTemplate",
+]
\ No newline at end of file
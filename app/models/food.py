@@ -66,3 +66,12 @@ class NutritionalValue(Base):
     
     # Relationships
     food = relationship("FoodItem", back_populates="nutrition")
+
+
+class CatalogVersion(Base):
+    """Single-row counter bumped whenever food or nutrition rows change"""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Enum, JSON, UniqueConstraint
 from .base import Base, MealType
 from sqlalchemy import Column, ForeignKey
 from sqlalchemy.orm import relationship
@@ -37,3 +37,45 @@ class Meal(Base):
         back_populates="meal",
         cascade="all, delete-orphan"
     )
+
+
+class DailyNutritionAggregate(Base):
+    """Per-user, per-day, per-meal-type nutrient totals.
+
+    Maintained incrementally as meals are logged so long-horizon trend
+    queries scan one row per day instead of every meal component.
+    """
+    __tablename__ = "daily_nutrition_aggregates"
+    __table_args__ = (
+        UniqueConstraint("owner_id", "day", "meal_type", name="uq_daily_aggregate"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    day = Column(Date, index=True, nullable=False)
+    meal_type = Column(Enum(MealType), nullable=False)
+    meal_count = Column(Integer, default=0, nullable=False)
+    nutrients = Column(JSON, default=dict, nullable=False)  # nutrient name -> total
+
+
+class DailyAggregateBackfill(Base):
+    """Marks users whose daily aggregates have been rebuilt from full history"""
+    __tablename__ = "daily_aggregate_backfills"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    catalog_version = Column(Integer, nullable=False)  # catalog the rebuild was computed against
+    backfilled_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class MealTemplate(Base):
+    """Saved meal with its nutrient totals precomputed for one-tap logging"""
+    __tablename__ = "meal_templates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    name = Column(String, nullable=False)
+    meal_type = Column(Enum(MealType), nullable=False)
+    components = Column(JSON, nullable=False)  # [{food_id, quantity, preparation_notes}]
+    nutrition = Column(JSON, nullable=False)  # nutrient name -> total
+    catalog_version = Column(Integer, nullable=False)  # catalog the totals were computed against
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,5 +1,9 @@
 from .user import Token, TokenData, UserCreate, User
-from .meal import MealType, MealCreate, Meal, MealComponent, MealResponse
+from .meal import (
+    MealType, MealCreate, Meal, MealComponent, MealResponse,
+    MealComponentDetail, SparseMealResponse
+)
+from .template import MealTemplateCreate, MealTemplate
 
 __all__ = [
     "Token",
@@ -11,6 +15,10 @@ __all__ = [
     "Meal",
     "MealComponent",
     "MealResponse",
+    "MealComponentDetail",
+    "SparseMealResponse",
+    "MealTemplateCreate",
+    "MealTemplate",
 ]
 
 
@@ -45,3 +45,16 @@ class MealResponse(MealBase):
     class Config:
         from_attributes = True
 
+class MealComponentDetail(MealComponent):
+    food_name: Optional[str] = None
+
+class SparseMealResponse(BaseModel):
+    """Meal with only the requested fields set (serialize with exclude_unset)"""
+    id: Optional[int] = None
+    meal_type: Optional[MealType] = None
+    name: Optional[str] = None
+    image_path: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    owner_id: Optional[int] = None
+    nutrition: Optional[dict] = None
+    components: Optional[List[MealComponentDetail]] = None
@@ -1,8 +1,8 @@
 # app/schemas/nutrition.py
 from datetime import date
 from pydantic import BaseModel
-from typing import List
-from .meal import MealResponse
+from typing import Dict, List, Optional
+from .meal import MealType, SparseMealResponse
 
 class DailyNutritionResponse(BaseModel):
     date: date
@@ -10,4 +10,37 @@ class DailyNutritionResponse(BaseModel):
     total_protein: float
     total_carbs: float
     total_fats: float
-    meals: List[MealResponse]
\ No newline at end of file
+    meals: List[SparseMealResponse]
+
+class TrendPoint(BaseModel):
+    date: date
+    total: float
+    rolling_means: Dict[int, Optional[float]]  # window (days) -> mean over logged days
+
+class NutritionTrendResponse(BaseModel):
+    nutrient: str
+    start_date: date
+    end_date: date
+    windows: List[int]
+    logged_days: int
+    min: Optional[float]
+    max: Optional[float]
+    mean: Optional[float]
+    meal_type_shares: Dict[MealType, float]
+    points: List[TrendPoint]
+
+class FoodSuggestion(BaseModel):
+    food_id: int
+    name: str
+    food_type: Optional[str]
+    state: Optional[str]
+    score: float  # Fraction of the remaining gap closed at the suggested quantity
+    quantity: float  # Suggested grams
+    nutrition: Dict[str, float]  # For the suggested quantity
+
+class FoodSuggestionResponse(BaseModel):
+    date: date
+    targets: Dict[str, float]
+    consumed: Dict[str, float]
+    remaining: Dict[str, float]
+    suggestions: List[FoodSuggestion]
\ No newline at end of file
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import datetime
+from .meal import MealType, MealComponent
+
+class MealTemplateCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    meal_type: MealType
+    components: List[MealComponent] = Field(..., min_items=1)
+
+class MealTemplate(BaseModel):
+    id: int
+    name: str
+    meal_type: MealType
+    components: List[MealComponent]
+    nutrition: dict  # Precomputed totals for every tracked nutrient
+    catalog_version: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
\ No newline at end of file
@@ -0,0 +1,37 @@
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+from app.models import FoodItem, NutritionalValue, CatalogVersion
+
+CATALOG_VERSION_ID = 1
+CATALOG_MODELS = (FoodItem, NutritionalValue)
+
+
+@event.listens_for(CatalogVersion.__table__, "after_create")
+def seed_catalog_version(target, connection, **kw):
+    """Create the single version row with the table, so bumps never insert it"""
+    connection.execute(insert(target).values(id=CATALOG_VERSION_ID, version=0))
+
+
+def get_catalog_version(db: Session) -> int:
+    """Current catalog version (0 until the catalog is first modified)"""
+    row = db.get(CatalogVersion, CATALOG_VERSION_ID)
+    return row.version if row else 0
+
+
+@event.listens_for(Session, "before_flush")
+def bump_catalog_version(session, flush_context, instances):
+    """Bump the catalog version in the same flush as any catalog write"""
+    pending = (session.new, session.dirty, session.deleted)
+    if not any(isinstance(obj, CATALOG_MODELS) for objs in pending for obj in objs):
+        return
+
+    # Increment in SQL so concurrent catalog edits can't both write N+1
+    bumped = session.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=CatalogVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not bumped:
+        # Table predates the seeded row
+        session.execute(insert(CatalogVersion).values(id=CATALOG_VERSION_ID, version=1))
\ No newline at end of file
@@ -1,7 +1,59 @@
-from .nutrition import calculate_meal_nutrition
-from app.models import Meal, UserMealLog
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from .nutrition import calculate_meal_nutrition, calculate_meal_nutrients, calculate_meals_nutrition, SUMMARY_FIELDS
+from .trends import record_meal_aggregate
+from app.models import FoodItem, Meal, UserMealLog
 from sqlalchemy.orm import Session
 
+# Top-level fields selectable with ``fields=``
+MEAL_FIELDS = ("id", "meal_type", "name", "image_path", "timestamp", "owner_id", "nutrition", "components")
+# Optional expansions selectable with ``include=``
+MEAL_INCLUDES = ("food_names",)
+
+
+
+def write_meal(
+    db: Session,
+    owner_id: int,
+    meal_type,
+    components: List[dict],
+    name: Optional[str] = None,
+    image_path: Optional[str] = None,
+    timestamp: Optional[datetime] = None,
+    nutrients: Optional[Dict[str, float]] = None
+) -> Meal:
+    """Insert a meal, its components and its daily aggregate (caller commits).
+
+    Pass precomputed ``nutrients`` (e.g. from a meal template) to skip
+    recomputing them from the components.
+    """
+    db_meal = Meal(
+        meal_type=meal_type,
+        name=name,
+        image_path=image_path,
+        owner_id=owner_id,
+        timestamp=timestamp or datetime.utcnow()
+    )
+    db.add(db_meal)
+    db.flush()  # Assigns db_meal.id
+
+    db.add_all([
+        UserMealLog(
+            meal_id=db_meal.id,
+            food_id=component["food_id"],
+            quantity=component["quantity"],
+            preparation_notes=component.get("preparation_notes")
+        )
+        for component in components
+    ])
+    db.flush()
+
+    # Keep per-day trend aggregates current
+    if nutrients is None:
+        nutrients = calculate_meal_nutrients(db_meal, db)
+    record_meal_aggregate(db_meal, nutrients, db)
+    return db_meal
 
 
 def format_meal_response(meal: Meal, db: Session) -> dict:
@@ -32,4 +84,99 @@ def format_meal_response(meal: Meal, db: Session) -> dict:
         "owner_id": meal.owner_id,
         "nutrition": nutrition,
         "components": formatted_components
-    }
\ No newline at end of file
+    }
+
+
+def _split_param(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def parse_meal_fieldset(
+    fields: Optional[str],
+    include: Optional[str] = None
+) -> Tuple[Set[str], Optional[Set[str]], Set[str]]:
+    """Parse ``fields``/``include`` query values for meal list endpoints.
+
+    Returns the selected top-level fields, the selected nutrients (``None``
+    for the default summary) and the requested expansions. ``fields`` accepts
+    ``nutrition.<nutrient>`` to return only some nutrients. Raises
+    ``ValueError`` on unknown names.
+    """
+    selected = set(MEAL_FIELDS) if not fields else set()
+    nutrients = None
+    for field in _split_param(fields):
+        if field.startswith("nutrition."):
+            nutrient = field.split(".", 1)[1]
+            if nutrient not in SUMMARY_FIELDS:
+                raise ValueError(f"Unknown nutrient field: {nutrient}")
+            nutrients = (nutrients or set()) | {nutrient}
+            selected.add("nutrition")
+        elif field in MEAL_FIELDS:
+            selected.add(field)
+        else:
+            raise ValueError(f"Unknown field: {field}")
+
+    includes = set(_split_param(include))
+    unknown = includes - set(MEAL_INCLUDES)
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}")
+    if "food_names" in includes:
+        selected.add("components")
+
+    return selected, nutrients, includes
+
+
+def format_meal_list(
+    meals: List[Meal],
+    db: Session,
+    fields: Optional[Set[str]] = None,
+    nutrients: Optional[Set[str]] = None,
+    includes: Optional[Set[str]] = None,
+    nutrition: Optional[Dict[int, dict]] = None
+) -> List[dict]:
+    """Format many meals at once, loading only what the fieldset needs.
+
+    Nutrition and components are fetched with one query each for the whole
+    page instead of per meal; food names are only joined when requested.
+    A precomputed ``nutrition`` map can be passed to avoid recomputing it.
+    """
+    fields = set(MEAL_FIELDS) if fields is None else fields
+    includes = includes or set()
+    meal_ids = [meal.id for meal in meals]
+
+    if "nutrition" in fields and nutrition is None:
+        nutrition = calculate_meals_nutrition(meal_ids, db, fields=sorted(nutrients or SUMMARY_FIELDS))
+
+    components = defaultdict(list)
+    if "components" in fields and meal_ids:
+        with_names = "food_names" in includes
+        columns = [UserMealLog.meal_id, UserMealLog.food_id, UserMealLog.quantity, UserMealLog.preparation_notes]
+        query = db.query(*columns, FoodItem.name) if with_names else db.query(*columns)
+        if with_names:
+            query = query.join(FoodItem, FoodItem.id == UserMealLog.food_id)
+        for row in query.filter(UserMealLog.meal_id.in_(meal_ids)).order_by(UserMealLog.id):
+            component = {
+                "food_id": row.food_id,
+                "quantity": row.quantity,
+                "preparation_notes": row.preparation_notes
+            }
+            if with_names:
+                component["food_name"] = row.name
+            components[row.meal_id].append(component)
+
+    formatted = []
+    for meal in meals:
+        item = {
+            field: getattr(meal, field)
+            for field in ("id", "meal_type", "name", "image_path", "timestamp", "owner_id")
+            if field in fields
+        }
+        if "nutrition" in fields:
+            meal_nutrition = nutrition.get(meal.id, {})
+            if nutrients:
+                meal_nutrition = {k: v for k, v in meal_nutrition.items() if k in nutrients}
+            item["nutrition"] = meal_nutrition
+        if "components" in fields:
+            item["components"] = components[meal.id]
+        formatted.append(item)
+    return formatted
\ No newline at end of file
@@ -1,6 +1,17 @@
 from collections import defaultdict
+from typing import Dict, Iterable
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.models import Meal, UserMealLog
+from app.models import Meal, UserMealLog, NutritionalValue
+
+# Every per-100g nutrient column tracked on NutritionalValue
+NUTRIENT_FIELDS = [
+    column.name for column in NutritionalValue.__table__.columns
+    if column.name not in ("id", "food_id")
+]
+
+# Nutrients reported on meal responses
+SUMMARY_FIELDS = ['calories', 'protein', 'carbs', 'fats']
 
 def calculate_meal_nutrition(meal: Meal, db: Session) -> dict:
     """Calculate nutrition from meal components"""
@@ -14,8 +25,85 @@ def calculate_meal_nutrition(meal: Meal, db: Session) -> dict:
         ratio = comp.quantity / 100.0  # Calculate per-gram values
         
         # Sum all nutrients
-        for field in ['calories', 'protein', 'carbs', 'fats']:
+        for field in SUMMARY_FIELDS:
             totals[field] += getattr(nutrition, field) * ratio
     
     # Convert to schema
-    return dict(totals)
\ No newline at end of file
+    return dict(totals)
+
+def calculate_meal_nutrients(meal: Meal, db: Session) -> dict:
+    """Calculate totals for every tracked nutrient from meal components"""
+    totals = dict.fromkeys(NUTRIENT_FIELDS, 0.0)
+    components = db.query(UserMealLog).filter(
+        UserMealLog.meal_id == meal.id
+    ).all()
+
+    for comp in components:
+        nutrition = comp.food.nutrition
+        if nutrition is None:
+            continue
+        ratio = comp.quantity / 100.0
+        for field in NUTRIENT_FIELDS:
+            totals[field] += (getattr(nutrition, field) or 0.0) * ratio
+
+    return totals
+
+def calculate_components_nutrients(components: Iterable, db: Session) -> dict:
+    """Calculate totals for every tracked nutrient from unsaved meal components.
+
+    Loads all referenced nutrition rows in one query and raises ``KeyError``
+    with the offending food id if any component has no nutrition data.
+    """
+    components = list(components)
+    food_ids = {comp.food_id for comp in components}
+    rows = db.query(NutritionalValue).filter(
+        NutritionalValue.food_id.in_(food_ids)
+    ).all()
+    by_food = {row.food_id: row for row in rows}
+
+    totals = dict.fromkeys(NUTRIENT_FIELDS, 0.0)
+    for comp in components:
+        nutrition = by_food.get(comp.food_id)
+        if nutrition is None:
+            raise KeyError(comp.food_id)
+        ratio = comp.quantity / 100.0
+        for field in NUTRIENT_FIELDS:
+            totals[field] += (getattr(nutrition, field) or 0.0) * ratio
+
+    return totals
+
+def summarize_nutrients(nutrients: dict) -> dict:
+    """Reduce a full nutrient vector to the fields reported on meal responses"""
+    return {field: nutrients.get(field, 0.0) for field in SUMMARY_FIELDS}
+
+def calculate_meals_nutrition(
+    meal_ids: Iterable[int],
+    db: Session,
+    fields: Iterable[str] = SUMMARY_FIELDS
+) -> Dict[int, dict]:
+    """Calculate nutrition for many meals with a single aggregate query.
+
+    Meals without components map to an empty dict, matching
+    ``calculate_meal_nutrition``.
+    """
+    meal_ids = list(meal_ids)
+    fields = list(fields)
+    results = {meal_id: {} for meal_id in meal_ids}
+    if not meal_ids or not fields:
+        return results
+
+    rows = db.query(
+        UserMealLog.meal_id,
+        *[
+            func.sum(UserMealLog.quantity * getattr(NutritionalValue, field) / 100.0).label(field)
+            for field in fields
+        ]
+    ).join(
+        NutritionalValue, NutritionalValue.food_id == UserMealLog.food_id
+    ).filter(
+        UserMealLog.meal_id.in_(meal_ids)
+    ).group_by(UserMealLog.meal_id).all()
+
+    for row in rows:
+        results[row.meal_id] = {field: getattr(row, field) or 0.0 for field in fields}
+    return results
\ No newline at end of file
@@ -0,0 +1,193 @@
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import DailyNutritionAggregate, FoodItem, NutritionalValue
+from .catalog import get_catalog_version
+from .nutrition import SUMMARY_FIELDS
+
+# Nutrients the suggestion index matches on, in vector order
+SUGGESTION_FIELDS = list(SUMMARY_FIELDS)
+
+
+def _encode(values: Sequence[Optional[str]]):
+    """Dictionary-encode labels so filters compare small ints, not strings"""
+    labels = sorted(set(values), key=lambda v: (v is None, v or ""))
+    lookup = {label: code for code, label in enumerate(labels)}
+    return labels, np.array([lookup[v] for v in values], dtype=np.int16)
+
+
+def _code(labels: List[Optional[str]], value: str) -> int:
+    return labels.index(value) if value in labels else -1
+
+
+class FoodVectorIndex:
+    """In-memory index of catalog foods as normalized nutrient vectors.
+
+    Each food's per-100g vector is scaled by the default daily targets (so
+    grams and kcal are comparable) and stored as a unit vector plus its norm.
+    A query is one batched matrix-vector product against the gap direction,
+    from which each food's clamped best quantity and remaining residual follow
+    in closed form, then a top-k partition on the fraction of the gap closed.
+    """
+
+    def __init__(
+        self,
+        food_ids: Sequence[int],
+        names: Sequence[str],
+        food_types: Sequence[Optional[str]],
+        states: Sequence[Optional[str]],
+        vectors: np.ndarray,
+        catalog_version: int
+    ):
+        self.catalog_version = catalog_version
+        self.scale = np.array(
+            [settings.DEFAULT_NUTRITION_TARGETS[field] for field in SUGGESTION_FIELDS],
+            dtype=np.float64
+        )
+
+        vectors = np.nan_to_num(np.asarray(vectors, dtype=np.float64).reshape(-1, len(SUGGESTION_FIELDS)))
+        scaled = vectors / self.scale
+        norms = np.linalg.norm(scaled, axis=1)
+        keep = np.flatnonzero(norms > 0)  # Foods with no nutrient data can't close a gap
+
+        self.food_ids = np.asarray(food_ids, dtype=np.int64)[keep]
+        self.names = [names[i] for i in keep]
+        self.food_types, self.food_type_codes = _encode([food_types[i] for i in keep])
+        self.states, self.state_codes = _encode([states[i] for i in keep])
+        self.per_100g = vectors[keep]
+        self.norms = norms[keep]
+        self.units = (scaled[keep] / self.norms[:, None]).astype(np.float32)
+        # float32 copies for the per-query vector math
+        self._norms32 = self.norms.astype(np.float32)
+        self._inv_norms32 = (1.0 / self.norms).astype(np.float32)
+        self._norms_sq32 = (self.norms ** 2).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.food_ids)
+
+    def query(
+        self,
+        gap: Dict[str, float],
+        k: int = 10,
+        food_type: Optional[str] = None,
+        state: Optional[str] = None,
+        max_quantity: float = 500.0
+    ) -> List[dict]:
+        """Top-k foods closing ``gap`` (nutrient -> remaining amount).
+
+        Foods are ranked by how much of the gap they close at their suggested
+        quantity, i.e. the least-squares quantity clamped to ``max_quantity``.
+        A food pointing exactly along the gap but too dilute to close it
+        within the cap ranks below a denser, slightly off-direction one.
+        """
+        target = np.array([max(gap.get(field, 0.0), 0.0) for field in SUGGESTION_FIELDS]) / self.scale
+        target_norm = np.linalg.norm(target)
+        if target_norm == 0 or not len(self):
+            return []
+
+        cosines = self.units @ (target / target_norm).astype(np.float32)
+        norms, inv_norms, norms_sq = self._norms32, self._inv_norms32, self._norms_sq32
+        candidates = None
+        if food_type is not None or state is not None:
+            mask = np.ones(len(self), dtype=bool)
+            if food_type is not None:
+                mask &= self.food_type_codes == _code(self.food_types, food_type)
+            if state is not None:
+                mask &= self.state_codes == _code(self.states, state)
+            candidates = np.flatnonzero(mask)
+            cosines = cosines[candidates]
+            norms, inv_norms, norms_sq = norms[candidates], inv_norms[candidates], norms_sq[candidates]
+        if not len(cosines):
+            return []
+
+        # With v = unit * norm and u = cos * |t|: v.t = norm * u, and the
+        # unclamped least-squares quantity (in 100g units) is u / norm.
+        # |t - s v|^2 - |t|^2 = s * (s |v|^2 - 2 norm u), minimised for ranking.
+        projection = cosines * np.float32(target_norm)
+        servings = projection * inv_norms
+        np.clip(servings, 0.0, max_quantity / 100.0, out=servings)
+        excess = servings * norms_sq
+        excess -= 2 * norms * projection
+        excess *= servings
+
+        k = min(k, len(excess))
+        top = np.argpartition(excess, k - 1)[:k]
+        top = top[np.argsort(excess[top])]
+        closed = 1.0 - np.sqrt(np.maximum(target_norm ** 2 + excess[top].astype(np.float64), 0.0)) / target_norm
+        keep = closed > 0  # Drop foods that don't reduce the gap
+        top, closed = top[keep], closed[keep]
+
+        suggestions = []
+        for j, fraction in zip(top, closed):
+            i = candidates[j] if candidates is not None else j
+            quantity = float(servings[j]) * 100.0
+            suggestions.append({
+                "food_id": int(self.food_ids[i]),
+                "name": self.names[i],
+                "food_type": self.food_types[self.food_type_codes[i]],
+                "state": self.states[self.state_codes[i]],
+                "score": float(fraction),
+                "quantity": quantity,
+                "nutrition": dict(zip(SUGGESTION_FIELDS, (self.per_100g[i] * quantity / 100.0).tolist()))
+            })
+        return suggestions
+
+
+def build_food_index(db: Session, catalog_version: int) -> FoodVectorIndex:
+    """Load every food with nutrition data into a new index"""
+    rows = db.query(
+        FoodItem.id,
+        FoodItem.name,
+        FoodItem.food_type,
+        FoodItem.state,
+        *[getattr(NutritionalValue, field) for field in SUGGESTION_FIELDS]
+    ).join(NutritionalValue, NutritionalValue.food_id == FoodItem.id).all()
+
+    return FoodVectorIndex(
+        food_ids=[row[0] for row in rows],
+        names=[row[1] for row in rows],
+        food_types=[row[2] for row in rows],
+        states=[row[3] for row in rows],
+        vectors=np.array([row[4:] for row in rows], dtype=np.float64),
+        catalog_version=catalog_version
+    )
+
+
+class FoodIndexCache:
+    """Per-process index, rebuilt when the catalog version moves on"""
+
+    def __init__(self):
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> FoodVectorIndex:
+        catalog_version = get_catalog_version(db)
+        index = self._index
+        if index is not None and index.catalog_version == catalog_version:
+            return index
+
+        with self._lock:
+            if self._index is None or self._index.catalog_version != catalog_version:
+                self._index = build_food_index(db, catalog_version)
+            return self._index
+
+
+food_index_cache = FoodIndexCache()
+
+
+def get_day_nutrition(owner_id: int, day, db: Session) -> Dict[str, float]:
+    """Nutrient totals logged on a day, read from the daily aggregates"""
+    rows = db.query(DailyNutritionAggregate.nutrients).filter(
+        DailyNutritionAggregate.owner_id == owner_id,
+        DailyNutritionAggregate.day == day
+    ).all()
+
+    totals = dict.fromkeys(SUGGESTION_FIELDS, 0.0)
+    for (nutrients,) in rows:
+        for field in SUGGESTION_FIELDS:
+            totals[field] += (nutrients or {}).get(field, 0.0)
+    return totals
\ No newline at end of file
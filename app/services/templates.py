@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models import MealTemplate
+from .catalog import get_catalog_version
+from .nutrition import calculate_components_nutrients
+from app.schemas import MealComponent
+
+
+def refresh_template_nutrition(template: MealTemplate, db: Session) -> bool:
+    """Recompute a template's totals if the catalog changed since they were stored.
+
+    Returns whether the template was updated (caller commits).
+    """
+    catalog_version = get_catalog_version(db)
+    if template.catalog_version == catalog_version:
+        return False
+
+    components = [MealComponent(**c) for c in template.components]
+    template.nutrition = calculate_components_nutrients(components, db)
+    template.catalog_version = catalog_version
+    return True
+
+
+def template_meal_write(template: MealTemplate, name: Optional[str] = None) -> dict:
+    """``write_meal`` arguments logging a template with its copied totals"""
+    return {
+        "owner_id": template.owner_id,
+        "meal_type": template.meal_type,
+        "name": name or template.name,
+        "components": list(template.components),
+        "nutrients": dict(template.nutrition),
+        "timestamp": datetime.utcnow()
+    }
\ No newline at end of file
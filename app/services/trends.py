@@ -0,0 +1,226 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.models import Meal, UserMealLog, NutritionalValue, DailyNutritionAggregate, DailyAggregateBackfill
+from .catalog import get_catalog_version
+from .nutrition import NUTRIENT_FIELDS
+
+
+def record_meal_aggregate(meal: Meal, nutrients: Dict[str, float], db: Session) -> None:
+    """Fold a newly logged meal into its per-day aggregate (caller commits).
+
+    Must run in the same transaction that inserted the meal. The aggregate
+    is bumped with an SQL-side UPDATE before it is read, so the
+    read-add-write of the nutrient totals holds the write lock and cannot
+    lose a concurrent update. History predating aggregation, and totals
+    made stale by catalog edits, are rebuilt separately by
+    ``ensure_daily_aggregates``, never on the write path.
+    """
+    day = meal.timestamp.date()
+    match = (
+        DailyNutritionAggregate.owner_id == meal.owner_id,
+        DailyNutritionAggregate.day == day,
+        DailyNutritionAggregate.meal_type == meal.meal_type
+    )
+    updated = db.query(DailyNutritionAggregate).filter(*match).update(
+        {DailyNutritionAggregate.meal_count: DailyNutritionAggregate.meal_count + 1},
+        synchronize_session=False
+    )
+
+    if updated:
+        aggregate = db.query(DailyNutritionAggregate).filter(*match).populate_existing().one()
+    else:
+        aggregate = DailyNutritionAggregate(
+            owner_id=meal.owner_id,
+            day=day,
+            meal_type=meal.meal_type,
+            meal_count=1,
+            nutrients={}
+        )
+        db.add(aggregate)
+
+    # Reassign rather than mutate so SQLAlchemy sees the JSON change
+    totals = dict(aggregate.nutrients or {})
+    for field, value in nutrients.items():
+        totals[field] = totals.get(field, 0.0) + value
+    aggregate.nutrients = totals
+    db.flush()  # Later writes in the same transaction must see this row
+
+
+def _aggregate_history(owner_id: int, db: Session):
+    """Per-(day, meal type) totals for a user's whole history in one query.
+
+    Returns the buckets and the newest meal id they include.
+    """
+    rows = db.query(
+        Meal.id,
+        Meal.timestamp,
+        Meal.meal_type,
+        *[
+            func.sum(UserMealLog.quantity * getattr(NutritionalValue, field) / 100.0)
+            for field in NUTRIENT_FIELDS
+        ]
+    ).outerjoin(
+        UserMealLog, UserMealLog.meal_id == Meal.id
+    ).outerjoin(
+        NutritionalValue, NutritionalValue.food_id == UserMealLog.food_id
+    ).filter(
+        Meal.owner_id == owner_id
+    ).group_by(Meal.id).all()
+
+    buckets = {}
+    for meal_id, timestamp, meal_type, *totals in rows:
+        bucket = buckets.setdefault(
+            (timestamp.date(), meal_type),
+            {"meal_count": 0, "nutrients": dict.fromkeys(NUTRIENT_FIELDS, 0.0)}
+        )
+        bucket["meal_count"] += 1
+        for field, value in zip(NUTRIENT_FIELDS, totals):
+            bucket["nutrients"][field] += value or 0.0
+    return buckets, max((row[0] for row in rows), default=None)
+
+
+def _latest_meal_id(owner_id: int, db: Session):
+    return db.query(func.max(Meal.id)).filter(Meal.owner_id == owner_id).scalar()
+
+
+def rebuild_daily_aggregates(owner_id: int, db: Session) -> None:
+    """Recompute every per-day aggregate for a user from their meal history (caller commits).
+
+    History is read with one grouped query before the DELETE, so the write
+    lock is only held for the swap. If a meal landed in between, the (rare)
+    re-read happens under the lock. The rebuild is stamped with the catalog
+    version read before the history, so a concurrent catalog edit leaves it
+    stale rather than wrongly current.
+    """
+    catalog_version = get_catalog_version(db)
+    buckets, latest_meal_id = _aggregate_history(owner_id, db)
+
+    db.query(DailyNutritionAggregate).filter(
+        DailyNutritionAggregate.owner_id == owner_id
+    ).delete(synchronize_session=False)
+    if _latest_meal_id(owner_id, db) != latest_meal_id:
+        buckets, _ = _aggregate_history(owner_id, db)
+
+    if buckets:
+        db.execute(insert(DailyNutritionAggregate), [
+            {
+                "owner_id": owner_id,
+                "day": day,
+                "meal_type": meal_type,
+                "meal_count": bucket["meal_count"],
+                "nutrients": bucket["nutrients"]
+            }
+            for (day, meal_type), bucket in buckets.items()
+        ])
+    db.merge(DailyAggregateBackfill(
+        owner_id=owner_id,
+        catalog_version=catalog_version,
+        backfilled_at=datetime.utcnow()
+    ))
+    db.flush()
+
+
+def ensure_daily_aggregates(owner_id: int, db: Session) -> None:
+    """Rebuild a user's aggregates if never backfilled or the catalog changed since.
+
+    Aggregates add up nutrients at the catalog values current when each meal
+    was logged; rebuilding after catalog edits keeps trends consistent with
+    ``/nutrition/daily``, which always recomputes from the live catalog.
+    """
+    marker = db.get(DailyAggregateBackfill, owner_id)
+    if marker is not None and marker.catalog_version == get_catalog_version(db):
+        return
+
+    rebuild_daily_aggregates(owner_id, db)
+    db.commit()
+
+
+def compute_nutrition_trend(
+    owner_id: int,
+    nutrient: str,
+    start: date,
+    end: date,
+    windows: Iterable[int],
+    db: Session
+) -> dict:
+    """Rolling means, extremes and meal-type shares for one nutrient.
+
+    Works on one aggregate row per (day, meal type), so the cost depends on
+    the number of days requested, not on how many meals were logged. Rolling
+    means are averaged over logged days only, so gaps in logging do not drag
+    the average towards zero.
+    """
+    windows = sorted(set(windows))
+    lookback = max(windows) - 1
+    first_day = start - timedelta(days=lookback)
+    num_days = (end - first_day).days + 1
+
+    rows = db.query(
+        DailyNutritionAggregate.day,
+        DailyNutritionAggregate.meal_type,
+        DailyNutritionAggregate.meal_count,
+        DailyNutritionAggregate.nutrients
+    ).filter(
+        DailyNutritionAggregate.owner_id == owner_id,
+        DailyNutritionAggregate.day >= first_day,
+        DailyNutritionAggregate.day <= end
+    ).all()
+
+    daily = [0.0] * num_days
+    logged = [0] * num_days
+    meal_type_totals = defaultdict(float)
+    for day, meal_type, meal_count, nutrients in rows:
+        index = (day - first_day).days
+        value = (nutrients or {}).get(nutrient, 0.0)
+        daily[index] += value
+        if meal_count:
+            logged[index] = 1
+        if index >= lookback:
+            meal_type_totals[meal_type] += value
+
+    # Prefix sums make every window mean O(1)
+    value_prefix = [0.0] * (num_days + 1)
+    logged_prefix = [0] * (num_days + 1)
+    for i in range(num_days):
+        value_prefix[i + 1] = value_prefix[i] + daily[i]
+        logged_prefix[i + 1] = logged_prefix[i] + logged[i]
+
+    points: List[dict] = []
+    logged_values: List[float] = []
+    for i in range(lookback, num_days):
+        rolling_means = {}
+        for window in windows:
+            days_logged = logged_prefix[i + 1] - logged_prefix[i + 1 - window]
+            total = value_prefix[i + 1] - value_prefix[i + 1 - window]
+            rolling_means[window] = total / days_logged if days_logged else None
+        points.append({
+            "date": first_day + timedelta(days=i),
+            "total": daily[i],
+            "rolling_means": rolling_means
+        })
+        if logged[i]:
+            logged_values.append(daily[i])
+
+    range_total = value_prefix[num_days] - value_prefix[lookback]
+    meal_type_shares = {
+        meal_type: total / range_total
+        for meal_type, total in meal_type_totals.items()
+    } if range_total else {}
+
+    return {
+        "nutrient": nutrient,
+        "start_date": start,
+        "end_date": end,
+        "windows": windows,
+        "logged_days": len(logged_values),
+        "min": min(logged_values) if logged_values else None,
+        "max": max(logged_values) if logged_values else None,
+        "mean": sum(logged_values) / len(logged_values) if logged_values else None,
+        "meal_type_shares": meal_type_shares,
+        "points": points
+    }
\ No newline at end of file
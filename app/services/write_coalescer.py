@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from .meals import write_meal
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MealWriteCoalescer:
+    """Group-commit stage for meal writes.
+
+    Meal writes from concurrent requests are queued and committed by a single
+    writer thread in one transaction, flushed when ``max_batch_size`` writes
+    are pending or ``max_delay`` seconds after the first one arrived. Each
+    caller's future resolves with its meal id only after the commit returns,
+    so a write is acknowledged exactly when it would have been without
+    batching. If a batch fails, its writes are retried one transaction each
+    so a single bad write cannot fail its neighbours.
+
+    The coalescer is per process: with several uvicorn workers, each has its
+    own writer thread and their batches still contend for the SQLite lock.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_batch_size: int = 64,
+        max_delay: float = 0.005
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the writer thread (no-op if already running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="meal-write-coalescer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Commit everything queued so far and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def submit(self, **meal) -> Future:
+        """Queue a meal write; the future resolves to the new meal id.
+
+        Accepts the keyword arguments of ``write_meal`` (except ``db``).
+        """
+        future = Future()
+        self.start()
+        self._queue.put((meal, future))
+        return future
+
+    async def write(self, **meal) -> int:
+        """Queue a meal write and wait for its commit"""
+        return await asyncio.wrap_future(self.submit(**meal))
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._commit_batch(batch)
+
+        # Fail anything that raced in behind the stop marker
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[1].set_exception(RuntimeError("Meal write coalescer stopped"))
+
+    def _commit_batch(self, batch: List[Tuple[dict, Future]]) -> None:
+        batch = [(meal, future) for meal, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        if len(batch) > 1:
+            try:
+                meal_ids = self._write([meal for meal, _ in batch])
+            except Exception:
+                logger.warning(
+                    "Coalesced meal write failed, retrying %d writes individually",
+                    len(batch), exc_info=True
+                )
+            else:
+                for (_, future), meal_id in zip(batch, meal_ids):
+                    future.set_result(meal_id)
+                return
+
+        for meal, future in batch:
+            try:
+                meal_id, = self._write([meal])
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(meal_id)
+
+    def _write(self, meals: List[dict]) -> List[int]:
+        """Write meals in one transaction and return their ids"""
+        db = self.session_factory()
+        try:
+            meal_ids = [write_meal(db, **meal).id for meal in meals]
+            db.commit()
+            return meal_ids
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+meal_write_coalescer = MealWriteCoalescer(
+    max_batch_size=settings.WRITE_COALESCE_MAX_BATCH,
+    max_delay=settings.WRITE_COALESCE_MAX_DELAY_MS / 1000.0
+)
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Latency benchmark for food suggestion queries on a synthetic catalog.
+
+Usage::
+
+    python -m benchmarks.food_suggestions --foods 300000 --queries 200
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.services.suggestions import FoodVectorIndex
+
+FOOD_TYPES = ["vegetable", "fruit", "grain", "protein", "dairy", "snack", "beverage", "prepared_meal"]
+STATES = ["raw", "cooked", "processed", "dried", "frozen"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--foods", type=int, default=300_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = np.column_stack([
+        rng.uniform(0, 900, args.foods),  # calories
+        rng.uniform(0, 40, args.foods),  # protein
+        rng.uniform(0, 90, args.foods),  # carbs
+        rng.uniform(0, 60, args.foods),  # fats
+    ])
+
+    start = time.perf_counter()
+    index = FoodVectorIndex(
+        food_ids=range(1, args.foods + 1),
+        names=[f"food-{i}" for i in range(args.foods)],
+        food_types=[FOOD_TYPES[i] for i in rng.integers(0, len(FOOD_TYPES), args.foods)],
+        states=[STATES[i] for i in rng.integers(0, len(STATES), args.foods)],
+        vectors=vectors,
+        catalog_version=1
+    )
+    print(f"build: {1000 * (time.perf_counter() - start):.0f} ms for {len(index)} foods")
+
+    for label, filters in (("unfiltered", {}), ("food_type+state", {"food_type": "protein", "state": "cooked"})):
+        timings = []
+        for _ in range(args.queries):
+            gap = dict(zip(["calories", "protein", "carbs", "fats"], rng.uniform(0, [1200, 60, 150, 50])))
+            start = time.perf_counter()
+            index.query(gap, k=args.k, **filters)
+            timings.append(1000 * (time.perf_counter() - start))
+        timings.sort()
+        print(
+            f"{label:>16}: median {statistics.median(timings):.2f} ms  "
+            f"p95 {timings[int(0.95 * len(timings)) - 1]:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Load test for concurrent meal writes on SQLite.
+
+Compares meals/second and "database is locked" error rates for:
+
+- ``legacy``: the original create_meal path, committing the meal and its
+  components in separate transactions
+- ``direct``: ``write_meal`` in one transaction per request
+- ``coalesced``: writes group-committed through ``MealWriteCoalescer``
+
+Usage::
+
+    python -m benchmarks.meal_write_load --threads 32 --meals 50
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.models import FoodItem, Meal, NutritionalValue, User, UserMealLog
+from app.models.base import Base, MealType
+from app.services.meals import write_meal
+from app.services.nutrition import calculate_meal_nutrients
+from app.services.trends import record_meal_aggregate
+from app.services.write_coalescer import MealWriteCoalescer
+
+COMPONENTS = [
+    {"food_id": 1, "quantity": 150.0, "preparation_notes": None},
+    {"food_id": 2, "quantity": 80.0, "preparation_notes": None},
+]
+
+
+def make_session_factory(path, busy_timeout):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": busy_timeout}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = SessionLocal()
+    db.add(User(id=1, username="bench", email="bench@example.com", hashed_password="x"))
+    for food_id, calories in ((1, 130.0), (2, 155.0)):
+        db.add(FoodItem(id=food_id, name=f"food-{food_id}", food_type="grain", state="cooked"))
+        db.add(NutritionalValue(food_id=food_id, calories=calories, protein=5.0, carbs=20.0, fats=3.0))
+    db.commit()
+    db.close()
+    return SessionLocal
+
+
+def legacy_write(SessionLocal):
+    db = SessionLocal()
+    try:
+        db_meal = Meal(meal_type=MealType.lunch, owner_id=1, timestamp=datetime.utcnow())
+        db.add(db_meal)
+        db.commit()
+        db.refresh(db_meal)
+        for component in COMPONENTS:
+            db.add(UserMealLog(meal_id=db_meal.id, **component))
+        db.commit()
+        record_meal_aggregate(db_meal, calculate_meal_nutrients(db_meal, db), db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def direct_write(SessionLocal):
+    db = SessionLocal()
+    try:
+        write_meal(db, owner_id=1, meal_type=MealType.lunch, components=COMPONENTS)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run(mode, threads, meals_per_thread, busy_timeout):
+    with tempfile.TemporaryDirectory() as tmp:
+        SessionLocal = make_session_factory(os.path.join(tmp, "bench.db"), busy_timeout)
+        coalescer = None
+        if mode == "coalesced":
+            coalescer = MealWriteCoalescer(SessionLocal)
+            coalescer.start()
+            write = lambda: coalescer.submit(
+                owner_id=1, meal_type=MealType.lunch, components=COMPONENTS
+            ).result()
+        elif mode == "direct":
+            write = lambda: direct_write(SessionLocal)
+        else:
+            write = lambda: legacy_write(SessionLocal)
+
+        counts = {"ok": 0, "locked": 0, "other": 0}
+        counts_lock = threading.Lock()
+
+        def worker():
+            for _ in range(meals_per_thread):
+                try:
+                    write()
+                    outcome = "ok"
+                except OperationalError as e:
+                    outcome = "locked" if "locked" in str(e) else "other"
+                except Exception:
+                    outcome = "other"
+                with counts_lock:
+                    counts[outcome] += 1
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        if coalescer is not None:
+            coalescer.stop()
+        SessionLocal.kw["bind"].dispose()
+
+    total = threads * meals_per_thread
+    print(
+        f"{mode:>10}: {counts['ok'] / elapsed:8.1f} meals/s  "
+        f"lock errors {counts['locked']}/{total} ({100.0 * counts['locked'] / total:.1f}%)  "
+        f"other errors {counts['other']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--meals", type=int, default=50, help="meals per thread")
+    parser.add_argument("--busy-timeout", type=float, default=0.5, help="SQLite busy timeout (s)")
+    parser.add_argument("--modes", nargs="+", default=["legacy", "direct", "coalesced"])
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        run(mode, args.threads, args.meals, args.busy_timeout)
+
+
+if __name__ == "__main__":
+    main()
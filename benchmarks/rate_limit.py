@@ -0,0 +1,73 @@
+"""Per-request cost of the rate limiter.
+
+Times bucket acquisition for each backend and the full middleware around a
+no-op ASGI app, compared with calling the app directly.
+
+Usage::
+
+    python -m benchmarks.rate_limit --requests 100000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from app.core.auth import create_access_token
+from app.core.rate_limit import MemoryBucketStore, RateLimitMiddleware, SQLiteBucketStore
+
+RULES = {"POST /meals": {"user": "1000000/second", "ip": "1000000/second"}}
+
+
+async def noop_app(scope, receive, send):
+    pass
+
+
+async def time_app(app, scope, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(scope, None, None)
+    return time.perf_counter() - start
+
+
+def report(label, elapsed, requests):
+    print(f"{label:>28}: {1e6 * elapsed / requests:7.2f} us/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.requests
+
+    checks = [("POST /meals|user:bench", 1e6, 1e6), ("POST /meals|ip:127.0.0.1", 1e6, 1e6)]
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            "memory": MemoryBucketStore(),
+            "sqlite": SQLiteBucketStore(os.path.join(tmp, "buckets.db")),
+        }
+        for name, store in stores.items():
+            iterations = n if name == "memory" else n // 10
+            start = time.perf_counter()
+            for _ in range(iterations):
+                store.acquire(checks)
+            report(f"{name} store acquire", time.perf_counter() - start, iterations)
+
+    token = create_access_token({"sub": "bench"}).encode()
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/meals",
+        "client": ("127.0.0.1", 50000),
+        "headers": [(b"authorization", b"Bearer " + token)],
+    }
+    unmatched = {**scope, "method": "GET"}
+    limited = RateLimitMiddleware(noop_app, rules=RULES, max_concurrent=64)
+
+    report("bare app", asyncio.run(time_app(noop_app, scope, n)), n)
+    report("middleware, limited route", asyncio.run(time_app(limited, scope, n)), n)
+    report("middleware, other route", asyncio.run(time_app(limited, unmatched, n)), n)
+
+
+if __name__ == "__main__":
+    main()